@@ -1,6 +1,12 @@
 """API routes for video audio combiner."""
 
+import asyncio
+import os
+
+import numpy as np
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 
 from video_audio_combiner import __version__
 from video_audio_combiner.api.schemas import (
@@ -10,6 +16,8 @@ from video_audio_combiner.api.schemas import (
     ExtractResponse,
     FrameRequest,
     FrameResponse,
+    FramesRequest,
+    FramesResponse,
     HealthResponse,
     MergeRequest,
     MergeResponse,
@@ -20,6 +28,21 @@ from video_audio_combiner.api.schemas import (
     WaveformResponse,
 )
 from video_audio_combiner.services.ffmpeg_service import FFmpegService
+from video_audio_combiner.services.waveform import WaveformService
+
+_CPU_COUNT = os.cpu_count() or 2
+
+# Limits concurrently running CPU-bound analysis jobs (waveform, alignment) to
+# the number of cores, so parallel requests queue instead of thrashing
+_analysis_sem = asyncio.Semaphore(_CPU_COUNT)
+
+# ffmpeg processes are multi-threaded themselves, so fewer run at once. No
+# -threads is passed, so a lone preview or merge still gets every core
+_ffmpeg_sem = asyncio.Semaphore(max(1, _CPU_COUNT // 2))
+
+# Waveform peaks are rounded for the response: three decimals are finer than
+# a waveform view can show and cut the serialized size by about a third
+_WAVEFORM_PEAK_DECIMALS = 3
 
 router = APIRouter()
 ffmpeg_service = FFmpegService()
@@ -35,7 +58,9 @@ async def health_check() -> HealthResponse:
 async def get_audio_tracks(file_path: str) -> TracksResponse:
     """Get list of audio tracks from a video file."""
     try:
-        return ffmpeg_service.get_audio_tracks(file_path)
+        # ffprobe is cheap next to the ffmpeg jobs, so it skips _ffmpeg_sem and
+        # only moves off the event loop
+        return await asyncio.to_thread(ffmpeg_service.get_audio_tracks, file_path)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
     except ValueError as e:
@@ -50,9 +75,14 @@ async def extract_audio(request: ExtractRequest) -> ExtractResponse:
     the audio will be automatically stretched to match the target timing.
     """
     try:
-        return ffmpeg_service.extract_audio(
-            request.file_path, request.track_index, request.target_framerate
-        )
+        async with _ffmpeg_sem:
+            return await asyncio.to_thread(
+                ffmpeg_service.extract_audio,
+                request.file_path,
+                request.track_index,
+                request.target_framerate,
+                request.preserve_pitch,
+            )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
     except ValueError as e:
@@ -60,17 +90,29 @@ async def extract_audio(request: ExtractRequest) -> ExtractResponse:
 
 
 @router.post("/analyze/waveform", response_model=WaveformResponse)
-async def generate_waveform(request: WaveformRequest) -> WaveformResponse:
-    """Generate waveform peaks data for visualization."""
-    # Import here to avoid loading librosa at startup
-    from video_audio_combiner.services.waveform import WaveformService
+async def generate_waveform(request: WaveformRequest) -> Response:
+    """Generate waveform peaks data for visualization.
 
+    The peaks list can hold hundreds of thousands of values, so the response
+    is serialized straight from the NumPy array with orjson instead of being
+    validated and encoded through WaveformResponse (which still documents
+    the response shape).
+    """
     waveform_service = WaveformService()
     try:
-        return waveform_service.generate_peaks(request.wav_path, request.samples_per_second)
+        async with _analysis_sem:
+            peaks, duration_seconds, sample_rate = await asyncio.to_thread(
+                waveform_service.compute_peaks, request.wav_path, request.samples_per_second
+            )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
 
+    peaks = np.round(peaks, _WAVEFORM_PEAK_DECIMALS)
+    content = {"peaks": peaks, "duration_seconds": duration_seconds, "sample_rate": sample_rate}
+    return Response(
+        orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY), media_type="application/json"
+    )
+
 
 @router.post("/align/detect", response_model=AlignResponse)
 async def detect_alignment(request: AlignRequest) -> AlignResponse:
@@ -80,7 +122,10 @@ async def detect_alignment(request: AlignRequest) -> AlignResponse:
 
     alignment_service = AlignmentService()
     try:
-        return alignment_service.detect_alignment(request.main_wav_path, request.secondary_wav_path)
+        async with _analysis_sem:
+            return await alignment_service.detect_alignment(
+                request.main_wav_path, request.secondary_wav_path, request.max_offset_ms
+            )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
 
@@ -89,15 +134,17 @@ async def detect_alignment(request: AlignRequest) -> AlignResponse:
 async def merge_audio(request: MergeRequest) -> MergeResponse:
     """Merge aligned audio track into video file."""
     try:
-        return ffmpeg_service.merge_audio(
-            video_path=request.video_path,
-            audio_path=request.audio_path,
-            offset_ms=request.offset_ms,
-            output_path=request.output_path,
-            language=request.language,
-            title=request.title,
-            modify_original=request.modify_original,
-        )
+        async with _ffmpeg_sem:
+            return await asyncio.to_thread(
+                ffmpeg_service.merge_audio,
+                video_path=request.video_path,
+                audio_path=request.audio_path,
+                offset_ms=request.offset_ms,
+                output_path=request.output_path,
+                language=request.language,
+                title=request.title,
+                modify_original=request.modify_original,
+            )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
     except ValueError as e:
@@ -108,15 +155,17 @@ async def merge_audio(request: MergeRequest) -> MergeResponse:
 async def generate_preview(request: PreviewRequest) -> PreviewResponse:
     """Generate a preview clip with combined audio."""
     try:
-        return ffmpeg_service.generate_preview(
-            video_path=request.video_path,
-            audio_path=request.audio_path,
-            start_time_seconds=request.start_time_seconds,
-            duration_seconds=request.duration_seconds,
-            offset_ms=request.offset_ms,
-            mute_main_audio=request.mute_main_audio,
-            mute_secondary_audio=request.mute_secondary_audio,
-        )
+        async with _ffmpeg_sem:
+            return await asyncio.to_thread(
+                ffmpeg_service.generate_preview,
+                video_path=request.video_path,
+                audio_path=request.audio_path,
+                start_time_seconds=request.start_time_seconds,
+                duration_seconds=request.duration_seconds,
+                offset_ms=request.offset_ms,
+                mute_main_audio=request.mute_main_audio,
+                mute_secondary_audio=request.mute_secondary_audio,
+            )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
     except ValueError as e:
@@ -127,10 +176,30 @@ async def generate_preview(request: PreviewRequest) -> PreviewResponse:
 async def extract_frame(request: FrameRequest) -> FrameResponse:
     """Extract a single frame from video at the specified time."""
     try:
-        return ffmpeg_service.extract_frame(
-            video_path=request.video_path,
-            time_seconds=request.time_seconds,
-        )
+        async with _ffmpeg_sem:
+            return await asyncio.to_thread(
+                ffmpeg_service.extract_frame,
+                video_path=request.video_path,
+                time_seconds=request.time_seconds,
+                accurate_seek=request.accurate_seek,
+            )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.post("/extract/frames", response_model=FramesResponse)
+async def extract_frames(request: FramesRequest) -> FramesResponse:
+    """Extract several frames from a video in one request."""
+    try:
+        async with _ffmpeg_sem:
+            return await asyncio.to_thread(
+                ffmpeg_service.extract_frames,
+                video_path=request.video_path,
+                times_seconds=request.times_seconds,
+                accurate_seek=request.accurate_seek,
+            )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
     except ValueError as e:
@@ -37,6 +37,7 @@ class ExtractRequest(BaseModel):
     file_path: str
     track_index: int
     target_framerate: float | None = None
+    preserve_pitch: bool = True
 
 
 class ExtractResponse(BaseModel):
@@ -69,6 +70,7 @@ class AlignRequest(BaseModel):
 
     main_wav_path: str
     secondary_wav_path: str
+    max_offset_ms: float | None = None
 
 
 class AlignResponse(BaseModel):
@@ -121,6 +123,7 @@ class FrameRequest(BaseModel):
 
     video_path: str
     time_seconds: float
+    accurate_seek: bool = True
 
 
 class FrameResponse(BaseModel):
@@ -128,3 +131,17 @@ class FrameResponse(BaseModel):
 
     frame_path: str
     time_seconds: float
+
+
+class FramesRequest(BaseModel):
+    """Request to extract several frames from one video."""
+
+    video_path: str
+    times_seconds: list[float]
+    accurate_seek: bool = True
+
+
+class FramesResponse(BaseModel):
+    """Response containing extracted frame paths, in request order."""
+
+    frames: list[FrameResponse]
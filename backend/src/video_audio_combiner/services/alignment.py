@@ -1,12 +1,159 @@
 """Alignment service for audio synchronization."""
 
+import asyncio
+import functools
+import math
+import os
 from pathlib import Path
 
-import librosa
 import numpy as np
-from scipy import signal
+import soundfile as sf
+import soxr
 
 from video_audio_combiner.api.schemas import AlignResponse
+from video_audio_combiner.services import array_cache
+
+# Alignments found on the RMS energy envelope with a lower confidence than this
+# are redone on the onset strength envelope.
+RMS_CONFIDENCE_THRESHOLD = 0.3
+
+# Bump whenever the envelope computation changes, so envelopes persisted by
+# _load_envelope are recomputed
+ENVELOPE_CACHE_VERSION = 1
+
+# Number of hops decoded at a time when streaming the RMS envelope.
+STREAM_BLOCK_HOPS = 4096
+
+# Lag ranges at least this wide (~12 minutes at the default hop) and
+# COARSE_TO_FINE_RATIO times the secondary length are searched coarse-to-fine
+# (see AlignmentService._coarse_to_fine)
+COARSE_TO_FINE_MIN_LAGS = 2**15
+COARSE_TO_FINE_RATIO = 4
+COARSE_DECIMATION = 32
+COARSE_MIN_BLOCKS = 8
+COARSE_CANDIDATES = 8
+REFINE_RADIUS_FRAMES = 64
+
+# Lag ranges with lags * len(b) up to this factor times n * log2(n) are
+# correlated directly instead of by an FFT of length n
+DIRECT_CORRELATION_FACTOR = 15
+
+# Half-width in frames of the band around a correlation peak that is left out
+# of the sidelobe level for the confidence score
+CONFIDENCE_GUARD_FRAMES = 50
+
+
+def _load_wav(wav_path: str, sample_rate: int) -> np.ndarray:
+    """Read a WAV file as mono float32 at the given sample rate."""
+    y, native_sr = sf.read(wav_path, dtype="float32", always_2d=False)
+    if y.ndim > 1:
+        y = y.mean(axis=1)
+    if native_sr != sample_rate:
+        y = soxr.resample(y, native_sr, sample_rate)
+    return y
+
+
+def _rms_flux(rms: np.ndarray) -> np.ndarray:
+    """Turn per-hop RMS energy into an onset-like envelope of its rises."""
+    return np.maximum(np.diff(rms, prepend=rms[:1]), 0.0)
+
+
+def _frame_rms(y: np.ndarray, hop_length: int, n_frames: int) -> np.ndarray:
+    """Compute the RMS energy of the first ``n_frames`` non-overlapping frames of a signal."""
+    frames = y[: n_frames * hop_length].reshape(n_frames, hop_length)
+    # einsum sums the squares without a frame-sized temporary
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / hop_length)
+
+
+def _rms_envelope(y: np.ndarray, hop_length: int) -> np.ndarray:
+    """Compute the RMS flux envelope of non-overlapping hops of a signal."""
+    return _rms_flux(_frame_rms(y, hop_length, len(y) // hop_length))
+
+
+def _stream_rms_envelope(wav_path: str, hop_length: int) -> np.ndarray:
+    """Compute the RMS flux envelope of a WAV file, one block of whole hops at a time."""
+    with sf.SoundFile(wav_path) as f:
+        rms = np.empty(f.frames // hop_length, dtype=np.float32)
+        frame = 0
+        for block in f.blocks(blocksize=hop_length * STREAM_BLOCK_HOPS, dtype="float32"):
+            if block.ndim > 1:
+                block = block.mean(axis=1)
+            n_frames = min(len(block) // hop_length, len(rms) - frame)
+            rms[frame : frame + n_frames] = _frame_rms(block, hop_length, n_frames)
+            frame += n_frames
+    return _rms_flux(rms[:frame])
+
+
+def _compute_envelope(wav_path: str, sample_rate: int, hop_length: int, kind: str) -> np.ndarray:
+    """Load an audio file and compute its normalized ``"rms"`` or ``"onset"`` envelope."""
+    if kind == "rms" and sf.info(wav_path).samplerate == sample_rate:
+        envelope = _stream_rms_envelope(wav_path, hop_length)
+    elif kind == "rms":
+        envelope = _rms_envelope(_load_wav(wav_path, sample_rate), hop_length)
+    else:
+        # librosa is slow to import and only needed for the onset fallback
+        import librosa
+
+        y = _load_wav(wav_path, sample_rate)
+        envelope = librosa.onset.onset_strength(y=y, sr=sample_rate, hop_length=hop_length)
+    envelope = envelope.astype(np.float32, copy=False)
+
+    # Normalize envelope; audio shorter than one hop has an empty one
+    peak = float(np.max(envelope)) if envelope.size else 0.0
+    if peak > 0:
+        np.divide(envelope, peak, out=envelope)
+    return envelope
+
+
+@functools.lru_cache(maxsize=8)
+def _load_envelope(
+    wav_path: str, mtime_ns: int, sample_rate: int, hop_length: int, kind: str
+) -> np.ndarray:
+    """Get the normalized alignment envelope of an audio file, cached in memory and on disk.
+
+    ``mtime_ns`` is part of the key so a rewritten file is picked up again. The
+    returned array is read-only.
+    """
+    key = (
+        f"{wav_path}:{os.stat(wav_path).st_size}:{mtime_ns}:{sample_rate}:{hop_length}:{kind}:"
+        f"{ENVELOPE_CACHE_VERSION}"
+    )
+    envelope = array_cache.load(array_cache.ENVELOPES, key)
+    if envelope is None:
+        envelope = _compute_envelope(wav_path, sample_rate, hop_length, kind)
+        array_cache.store(array_cache.ENVELOPES, key, envelope)
+
+    envelope.flags.writeable = False
+    return envelope
+
+
+def _decimate(envelope: np.ndarray, factor: int) -> np.ndarray:
+    """Downsample an envelope by block means and remove its mean."""
+    coarse = envelope[: len(envelope) // factor * factor].reshape(-1, factor).mean(axis=1)
+    return coarse - coarse.mean()
+
+
+def _spectrum_length(envelope_length: int) -> int:
+    """Get the rFFT length of a cached main envelope spectrum."""
+    from scipy.fft import next_fast_len
+
+    return next_fast_len(max(2 * envelope_length, 1), real=True)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_spectrum(
+    wav_path: str, mtime_ns: int, sample_rate: int, hop_length: int, kind: str
+) -> np.ndarray:
+    """Compute the (read-only) rFFT of an alignment envelope at its canonical length."""
+    from scipy.fft import rfft
+
+    envelope = _load_envelope(wav_path, mtime_ns, sample_rate, hop_length, kind)
+    spectrum = rfft(envelope, _spectrum_length(len(envelope)))
+    spectrum.flags.writeable = False
+    return spectrum
+
+
+EnvelopeKey = tuple[str, int, int, int, str]
 
 
 class AlignmentService:
@@ -22,15 +169,229 @@ class AlignmentService:
         self.sample_rate = sample_rate
         self.hop_length = hop_length
 
-    def detect_alignment(self, main_wav_path: str, secondary_wav_path: str) -> AlignResponse:
+    def _validate_paths(self, main_wav_path: str, secondary_wav_path: str) -> None:
+        """Check that both audio files of an alignment exist.
+
+        Raises:
+            FileNotFoundError: If either file doesn't exist.
+        """
+        if not Path(main_wav_path).exists():
+            raise FileNotFoundError(f"Main audio file not found: {main_wav_path}")
+        if not Path(secondary_wav_path).exists():
+            raise FileNotFoundError(f"Secondary audio file not found: {secondary_wav_path}")
+
+    def _key(self, wav_path: str, kind: str = "onset") -> EnvelopeKey:
+        """Get the envelope cache key of an audio file."""
+        path = Path(wav_path).resolve()
+        return str(path), path.stat().st_mtime_ns, self.sample_rate, self.hop_length, kind
+
+    def _envelope(self, wav_path: str, kind: str = "onset") -> np.ndarray:
+        """Get the (cached) normalized alignment envelope of an audio file."""
+        return _load_envelope(*self._key(wav_path, kind))
+
+    def _reference(self, wav_path: str, kind: str = "onset") -> tuple[np.ndarray, np.ndarray]:
+        """Get the (cached) envelope of a main audio file and its spectrum."""
+        key = self._key(wav_path, kind)
+        return _load_envelope(*key), _load_spectrum(*key)
+
+    async def _envelopes(
+        self, main_wav_path: str, secondary_wav_path: str, kind: str = "onset"
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the envelopes of both files, loading them concurrently.
+
+        Returns:
+            Tuple of (envelope_main, envelope_secondary, spectrum_main).
+        """
+        (envelope_main, spectrum_main), envelope_secondary = await asyncio.gather(
+            asyncio.to_thread(self._reference, main_wav_path, kind),
+            asyncio.to_thread(self._envelope, secondary_wav_path, kind),
+        )
+        return envelope_main, envelope_secondary, spectrum_main
+
+    @staticmethod
+    def _cross_correlate(
+        a: np.ndarray,
+        b: np.ndarray,
+        min_lag: int | None = None,
+        max_lag: int | None = None,
+        a_spectrum: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Compute the cross-correlation of two envelopes over a range of lags.
+
+        Args:
+            a: Reference envelope.
+            b: Envelope to slide against the reference.
+            min_lag: Smallest lag to return. Defaults to ``-(len(b) - 1)``.
+            max_lag: Largest lag to return. Defaults to ``len(a) - 1``.
+            a_spectrum: Cached rFFT of ``a`` from ``_load_spectrum``, if available.
+
+        Returns:
+            Correlation values where index ``i`` holds lag ``min_lag + i``.
+        """
+        from scipy.fft import irfft, next_fast_len, rfft
+
+        if min_lag is None:
+            min_lag = -(len(b) - 1)
+        if max_lag is None:
+            max_lag = len(a) - 1
+
+        n = next_fast_len(max(len(a) - min_lag, max_lag + len(b)), real=True)
+        if (max_lag - min_lag + 1) * len(b) <= DIRECT_CORRELATION_FACTOR * n * math.log2(n):
+            from video_audio_combiner.services.alignment_kernels import bounded_correlate
+
+            return bounded_correlate(a, b, min_lag, max_lag)
+
+        # Reuse the cached spectrum unless it is much longer than needed
+        canonical_n = _spectrum_length(len(a))
+        if a_spectrum is not None and n <= canonical_n <= 1.5 * n:
+            n, spectrum_a = canonical_n, a_spectrum
+            spectrum_b = rfft(b, n)
+        else:
+            # Both forward transforms in one batch, so pocketfft can parallelize them
+            batch = np.zeros((2, n), dtype=np.result_type(a, b))
+            batch[0, : len(a)] = a[:n]
+            batch[1, : len(b)] = b[:n]
+            spectrum_a, spectrum_b = rfft(batch, axis=-1, workers=-1)
+        circular = irfft(spectrum_a * np.conj(spectrum_b), n)
+
+        # Negative lags wrap around to the end of the circular result
+        return np.take(circular, np.arange(min_lag, max_lag + 1), mode="wrap")
+
+    def _align_envelopes(
+        self,
+        envelope_main: np.ndarray,
+        envelope_secondary: np.ndarray,
+        spectrum_main: np.ndarray | None = None,
+        max_offset_ms: float | None = None,
+    ) -> tuple[int, float]:
+        """Find the best lag between two envelopes.
+
+        Args:
+            envelope_main: Envelope of the main (reference) audio.
+            envelope_secondary: Envelope of the secondary audio.
+            spectrum_main: Cached rFFT of ``envelope_main``, if available.
+            max_offset_ms: If provided, only lags within +/- this many
+                milliseconds are considered.
+
+        Returns:
+            Tuple of (lag_frames, confidence).
+        """
+        # Search every lag with some overlap
+        min_lag, max_lag = -(len(envelope_secondary) - 1), len(envelope_main) - 1
+        if max_offset_ms is not None:
+            max_offset_frames = max(
+                0, int(max_offset_ms / 1000 * self.sample_rate / self.hop_length)
+            )
+            min_lag = max(min_lag, -max_offset_frames)
+            max_lag = min(max_lag, max_offset_frames)
+
+        n_lags = max_lag - min_lag + 1
+        if (
+            n_lags >= COARSE_TO_FINE_MIN_LAGS
+            and len(envelope_secondary) * COARSE_TO_FINE_RATIO <= n_lags
+            and len(envelope_secondary) >= COARSE_DECIMATION * COARSE_MIN_BLOCKS
+        ):
+            return self._coarse_to_fine(envelope_main, envelope_secondary, min_lag, max_lag)
+
+        # Cross-correlation to find best alignment
+        correlation = self._cross_correlate(
+            envelope_main, envelope_secondary, min_lag, max_lag, spectrum_main
+        )
+        peak_index, confidence = self._find_peak(correlation)
+
+        return min_lag + peak_index, confidence
+
+    def _coarse_to_fine(
+        self, envelope_main: np.ndarray, envelope_secondary: np.ndarray, min_lag: int, max_lag: int
+    ) -> tuple[int, float]:
+        """Find the best lag within a wide range on decimated envelopes, then refine it.
+
+        Args:
+            envelope_main: Envelope of the main (reference) audio.
+            envelope_secondary: Envelope of the secondary audio.
+            min_lag: Smallest lag to consider.
+            max_lag: Largest lag to consider.
+
+        Returns:
+            Tuple of (lag_frames, confidence), scored on the coarse correlation.
+        """
+        d = COARSE_DECIMATION
+        coarse_main = _decimate(envelope_main, d)
+        coarse_secondary = _decimate(envelope_secondary, d)
+        coarse_min_lag = min_lag // d
+        coarse_correlation = self._cross_correlate(
+            coarse_main, coarse_secondary, coarse_min_lag, -(-max_lag // d)
+        )
+        _, confidence = self._find_peak(coarse_correlation, max(1, CONFIDENCE_GUARD_FRAMES // d))
+
+        # Refine several coarse peaks, since decimation can blur the true one
+        n_candidates = min(COARSE_CANDIDATES, len(coarse_correlation))
+        candidates = np.argpartition(coarse_correlation, -n_candidates)[-n_candidates:]
+
+        best_lag, best_value = min_lag, -np.inf
+        for candidate in candidates:
+            coarse_lag = (coarse_min_lag + int(candidate)) * d
+            low = max(min_lag, coarse_lag - REFINE_RADIUS_FRAMES)
+            high = min(max_lag, coarse_lag + REFINE_RADIUS_FRAMES)
+            if low > high:
+                continue
+
+            # Only the part of the main envelope the window overlaps
+            start = max(0, low)
+            stop = min(len(envelope_main), high + len(envelope_secondary))
+            correlation = self._cross_correlate(
+                envelope_main[start:stop], envelope_secondary, low - start, high - start
+            )
+            peak_index = int(np.argmax(correlation))
+            if correlation[peak_index] > best_value:
+                best_lag, best_value = low + peak_index, float(correlation[peak_index])
+
+        return best_lag, confidence
+
+    def _find_peak(
+        self, correlation: np.ndarray, guard_frames: int = CONFIDENCE_GUARD_FRAMES
+    ) -> tuple[int, float]:
+        """Locate the correlation peak and score it by its peak-to-sidelobe ratio.
+
+        Args:
+            correlation: Correlation values.
+            guard_frames: Half-width of the guard band around the peak.
+
+        Returns:
+            Tuple of (peak_index, confidence) with confidence between 0 and 1.
+        """
+        peak_index = int(np.argmax(correlation))
+        energy = float(np.dot(correlation, correlation))
+        peak = float(correlation[peak_index])
+        # Keep some sidelobes in narrow search windows
+        guard_frames = min(guard_frames, len(correlation) // 4)
+        guard = correlation[max(0, peak_index - guard_frames) : peak_index + guard_frames + 1]
+        sidelobe_count = len(correlation) - len(guard)
+        if peak <= 0 or sidelobe_count == 0:
+            return peak_index, 0.0
+
+        sidelobe_energy = energy - float(np.dot(guard, guard))
+        noise = np.sqrt(max(sidelobe_energy, 0.0) / sidelobe_count)
+        if noise == 0:
+            return peak_index, 1.0
+        return peak_index, min(1.0, peak / noise / 10.0)
+
+    async def detect_alignment(
+        self,
+        main_wav_path: str,
+        secondary_wav_path: str,
+        max_offset_ms: float | None = None,
+    ) -> AlignResponse:
         """Detect the alignment offset between two audio files.
 
-        Uses onset strength envelopes and cross-correlation to find
+        Uses energy/onset envelopes and cross-correlation to find
         the best alignment offset between the main and secondary audio.
 
         Args:
             main_wav_path: Path to the main (reference) audio file.
             secondary_wav_path: Path to the secondary audio file to align.
+            max_offset_ms: If provided, only offsets within +/- this many
+                milliseconds are considered.
 
         Returns:
             AlignResponse with offset in milliseconds and confidence score.
@@ -38,53 +399,39 @@ class AlignmentService:
         Raises:
             FileNotFoundError: If either file doesn't exist.
         """
-        main_path = Path(main_wav_path)
-        secondary_path = Path(secondary_wav_path)
-
-        if not main_path.exists():
-            raise FileNotFoundError(f"Main audio file not found: {main_wav_path}")
-        if not secondary_path.exists():
-            raise FileNotFoundError(f"Secondary audio file not found: {secondary_wav_path}")
+        self._validate_paths(main_wav_path, secondary_wav_path)
 
-        # Load audio files
-        y_main, _ = librosa.load(main_wav_path, sr=self.sample_rate, mono=True)
-        y_secondary, _ = librosa.load(secondary_wav_path, sr=self.sample_rate, mono=True)
-
-        # Compute onset strength envelopes
-        onset_main = librosa.onset.onset_strength(
-            y=y_main, sr=self.sample_rate, hop_length=self.hop_length
-        )
-        onset_secondary = librosa.onset.onset_strength(
-            y=y_secondary, sr=self.sample_rate, hop_length=self.hop_length
+        rms_main, rms_secondary, rms_spectrum = await self._envelopes(
+            main_wav_path, secondary_wav_path, "rms"
         )
 
-        # Normalize envelopes
-        if np.max(onset_main) > 0:
-            onset_main = onset_main / np.max(onset_main)
-        if np.max(onset_secondary) > 0:
-            onset_secondary = onset_secondary / np.max(onset_secondary)
+        # Nothing to align on if the energy never rises (e.g. silence)
+        if not rms_main.any() or not rms_secondary.any():
+            return AlignResponse(offset_ms=0.0, confidence=0.0)
 
-        # Cross-correlation to find best alignment
-        correlation = signal.correlate(onset_main, onset_secondary, mode="full")
-        lag_samples = np.argmax(correlation) - len(onset_secondary) + 1
+        # Try the cheap RMS energy flux first and fall back to onset strength
+        lag_frames, confidence = await asyncio.to_thread(
+            self._align_envelopes, rms_main, rms_secondary, rms_spectrum, max_offset_ms
+        )
+        if confidence < RMS_CONFIDENCE_THRESHOLD:
+            onset_main, onset_secondary, onset_spectrum = await self._envelopes(
+                main_wav_path, secondary_wav_path, "onset"
+            )
+            lag_frames, confidence = await asyncio.to_thread(
+                self._align_envelopes, onset_main, onset_secondary, onset_spectrum, max_offset_ms
+            )
 
         # Convert lag from frames to milliseconds
         frame_duration_seconds = self.hop_length / self.sample_rate
-        offset_seconds = lag_samples * frame_duration_seconds
+        offset_seconds = lag_frames * frame_duration_seconds
         offset_ms = offset_seconds * 1000
 
-        # Calculate confidence score
-        # Higher correlation peak relative to mean indicates better match
-        max_corr = np.max(correlation)
-        mean_corr = np.mean(np.abs(correlation))
-        confidence = min(1.0, max_corr / mean_corr / 10.0) if mean_corr > 0 else 0.0
-
         return AlignResponse(
             offset_ms=float(offset_ms),
             confidence=float(confidence),
         )
 
-    def compute_correlation_curve(
+    async def compute_correlation_curve(
         self, main_wav_path: str, secondary_wav_path: str
     ) -> tuple[np.ndarray, np.ndarray]:
         """Compute the full correlation curve for visualization.
@@ -96,37 +443,22 @@ class AlignmentService:
         Returns:
             Tuple of (lag_values_ms, correlation_values).
         """
-        main_path = Path(main_wav_path)
-        secondary_path = Path(secondary_wav_path)
+        self._validate_paths(main_wav_path, secondary_wav_path)
 
-        if not main_path.exists():
-            raise FileNotFoundError(f"Main audio file not found: {main_wav_path}")
-        if not secondary_path.exists():
-            raise FileNotFoundError(f"Secondary audio file not found: {secondary_wav_path}")
-
-        # Load audio files
-        y_main, _ = librosa.load(main_wav_path, sr=self.sample_rate, mono=True)
-        y_secondary, _ = librosa.load(secondary_wav_path, sr=self.sample_rate, mono=True)
-
-        # Compute onset strength envelopes
-        onset_main = librosa.onset.onset_strength(
-            y=y_main, sr=self.sample_rate, hop_length=self.hop_length
-        )
-        onset_secondary = librosa.onset.onset_strength(
-            y=y_secondary, sr=self.sample_rate, hop_length=self.hop_length
+        onset_main, onset_secondary, onset_spectrum = await self._envelopes(
+            main_wav_path, secondary_wav_path
         )
+        # Audio shorter than one hop has no lags to plot
+        if not onset_main.size or not onset_secondary.size:
+            return np.empty(0), np.empty(0, dtype=np.float32)
 
-        # Normalize
-        if np.max(onset_main) > 0:
-            onset_main = onset_main / np.max(onset_main)
-        if np.max(onset_secondary) > 0:
-            onset_secondary = onset_secondary / np.max(onset_secondary)
-
-        # Cross-correlation
-        correlation = signal.correlate(onset_main, onset_secondary, mode="full")
-
-        # Normalize correlation
-        correlation = correlation / np.max(np.abs(correlation))
+        # Cross-correlation (a fresh array, so it is normalized in place)
+        correlation = await asyncio.to_thread(
+            self._cross_correlate, onset_main, onset_secondary, a_spectrum=onset_spectrum
+        )
+        peak = max(float(correlation.max()), -float(correlation.min()))
+        if peak > 0:
+            np.divide(correlation, peak, out=correlation)
 
         # Compute lag values in milliseconds
         frame_duration_ms = (self.hop_length / self.sample_rate) * 1000
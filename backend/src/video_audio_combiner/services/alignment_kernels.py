@@ -0,0 +1,33 @@
+"""Numba-compiled kernels for the alignment service."""
+
+import numpy as np
+from numba import njit
+
+
+@njit(fastmath=True, cache=True)
+def bounded_correlate(a: np.ndarray, b: np.ndarray, min_lag: int, max_lag: int) -> np.ndarray:
+    """Cross-correlate two envelopes over a lag range by direct dot products.
+
+    Args:
+        a: Reference envelope.
+        b: Envelope to slide against the reference.
+        min_lag: Smallest lag to compute.
+        max_lag: Largest lag to compute.
+
+    Returns:
+        float32 correlation values where index ``i`` holds lag ``min_lag + i``.
+    """
+    out = np.empty(max_lag - min_lag + 1, dtype=np.float32)
+    for i in range(max_lag - min_lag + 1):
+        lag = min_lag + i
+        start = max(0, -lag)
+        # Lags without any overlap give an empty range (and a zero)
+        stop = max(start, min(len(b), len(a) - lag))
+        # Slice first so the inner loop vectorizes
+        x = a[start + lag : stop + lag]
+        y = b[start:stop]
+        acc = np.float32(0.0)
+        for j in range(len(y)):
+            acc += x[j] * y[j]
+        out[i] = acc
+    return out
@@ -0,0 +1,82 @@
+"""Best-effort on-disk cache for arrays derived from audio files."""
+
+import contextlib
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Each cache is a subdirectory of CACHE_ROOT
+CACHE_ROOT = Path(tempfile.gettempdir()) / "video-audio-combiner"
+ENVELOPES = "envelopes"
+PEAKS = "peaks"
+CACHE_NAMES = (ENVELOPES, PEAKS)
+
+# Entries kept per cache; the oldest ones beyond this are evicted on write
+MAX_ENTRIES = 256
+
+
+def _entry_path(name: str, key: str) -> Path:
+    """Get the file of a cache entry."""
+    return CACHE_ROOT / name / f"{hashlib.blake2b(key.encode()).hexdigest()[:32]}.npy"
+
+
+def load(name: str, key: str) -> np.ndarray | None:
+    """Load a cached array, or None if it is missing or unreadable."""
+    try:
+        return np.load(_entry_path(name, key))
+    except (OSError, ValueError):
+        return None
+
+
+def store(name: str, key: str, array: np.ndarray) -> None:
+    """Cache an array atomically, ignoring I/O errors."""
+    path = _entry_path(name, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(temp_path, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        return
+
+    _evict(path.parent)
+
+
+def _evict(directory: Path) -> None:
+    """Remove the oldest entries of a cache beyond MAX_ENTRIES."""
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(".npy"):
+                    with contextlib.suppress(OSError):
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+    except OSError:
+        return
+
+    entries.sort()
+    for _, path in entries[: max(0, len(entries) - MAX_ENTRIES)]:
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+
+
+def clear(name: str) -> None:
+    """Remove all entries of a cache, including leftover temp files."""
+    try:
+        with os.scandir(CACHE_ROOT / name) as it:
+            for entry in it:
+                if entry.name.endswith((".npy", ".tmp")) and entry.is_file():
+                    with contextlib.suppress(OSError):
+                        os.unlink(entry.path)
+    except OSError:
+        pass
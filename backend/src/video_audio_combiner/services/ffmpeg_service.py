@@ -1,31 +1,178 @@
 """FFmpeg service for video/audio operations."""
 
-import json
+import contextlib
+import functools
+import hashlib
+import itertools
+import math
+import os
+import re
+import shutil
+import struct
 import subprocess
 import tempfile
+from collections.abc import Iterable
 from pathlib import Path
 
+import orjson
+import soundfile as sf
+
 from video_audio_combiner.api.schemas import (
     AudioTrack,
     ExtractResponse,
     FrameResponse,
+    FramesResponse,
     MergeResponse,
     PreviewResponse,
     TracksResponse,
 )
+from video_audio_combiner.services import array_cache
+
+# Sample rate of extracted analysis audio
+ANALYSIS_SAMPLE_RATE = 22050
+
+# Uncached frames within this many seconds of each other share one ffmpeg run
+FRAME_CLUSTER_SECONDS = 10.0
+
+# ffmpeg invocation prefix that only writes errors to stderr
+FFMPEG = ("ffmpeg", "-hide_banner", "-nostats", "-v", "error")
+
+# Keywords marking the stderr lines worth showing when ffmpeg fails
+_FFMPEG_ERROR_PATTERN = re.compile(
+    r"error|invalid|failed|cannot|unable|no such|not found|does not|undefined|unknown",
+    re.IGNORECASE,
+)
+
+# Hardware H.264 encoders to try for previews, roughly matching libx264 at CRF 28
+_HARDWARE_H264_ENCODERS = (
+    ("-c:v", "h264_videotoolbox", "-b:v", "4M"),  # macOS
+    ("-c:v", "h264_nvenc", "-preset", "p1", "-cq", "28"),  # NVIDIA
+)
+
+# Audio codecs merge_audio can copy into each output container without re-encoding
+_COPYABLE_AUDIO_CODECS = {
+    ".mkv": {"aac", "ac3", "eac3", "flac", "mp3", "opus", "vorbis"},
+    ".mp4": {"aac", "ac3", "eac3"},
+    ".m4v": {"aac", "ac3", "eac3"},
+    ".mov": {"aac", "ac3", "eac3"},
+}
+
+
+def _run_ffprobe_json(args: list[str]) -> dict:
+    """Run ffprobe with JSON output and parse it.
+
+    Raises:
+        ValueError: If ffprobe fails or its output can't be parsed.
+    """
+    cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", *args]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        return orjson.loads(result.stdout)
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"ffprobe failed: {e.stderr.decode(errors='replace')}") from e
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Failed to parse ffprobe output: {e}") from e
+
+
+@functools.lru_cache(maxsize=128)
+def _probe(file_path: str, size: int, mtime_ns: int) -> dict:
+    """Run ffprobe on a file, memoized per path, size and mtime.
+
+    The returned dict is shared between callers and must not be mutated.
+
+    Raises:
+        ValueError: If ffprobe fails.
+    """
+    return _run_ffprobe_json(["-show_format", "-show_streams", file_path])
+
+
+@functools.lru_cache(maxsize=128)
+def _first_video_packet(file_path: str, size: int, mtime_ns: int, time: float) -> dict | None:
+    """Get the first video packet after seeking to a time, memoized like ``_probe``.
+
+    Raises:
+        ValueError: If ffprobe fails.
+    """
+    probe_data = _run_ffprobe_json(
+        [
+            "-select_streams",
+            "v:0",
+            "-read_intervals",
+            f"{time}%+#1",
+            "-show_entries",
+            "packet=pts_time,flags",
+            file_path,
+        ]
+    )
+    packets = probe_data.get("packets") or [None]
+    return packets[0]
+
+
+def _run_ffmpeg(cmd: list[str]) -> None:
+    """Run an ffmpeg command whose output goes to a file, spooling stderr to disk.
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg exits with an error, with
+            ``stderr`` set to its decoded error output.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        returncode = subprocess.call(cmd, stdout=subprocess.DEVNULL, stderr=stderr)
+        if returncode != 0:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                returncode, cmd, stderr=stderr.read().decode(errors="replace")
+            )
+
+
+@functools.cache
+def _hardware_h264_encoder() -> tuple[str, ...] | None:
+    """Find a working hardware H.264 encoder for previews with a tiny test encode.
+
+    Returns:
+        Video codec arguments for the first encoder that works, or None to use
+        libx264.
+    """
+    for encoder_args in _HARDWARE_H264_ENCODERS:
+        cmd = [
+            *FFMPEG,
+            "-f",
+            "lavfi",
+            "-i",
+            "color=c=black:s=256x256:d=0.1",
+            "-frames:v",
+            "1",
+            *encoder_args,
+            "-f",
+            "null",
+            "-",
+        ]
+        try:
+            _run_ffmpeg(cmd)
+        except (OSError, subprocess.CalledProcessError):
+            continue
+        return encoder_args
+    return None
 
 
 class FFmpegService:
     """Service for FFmpeg operations."""
 
-    def __init__(self, temp_dir: Path | None = None):
+    def __init__(self, temp_dir: Path | None = None, threads: int | None = None):
         """Initialize FFmpeg service.
 
         Args:
             temp_dir: Directory for temporary files. Uses system temp if None.
+            threads: Thread count passed to each ffmpeg invocation via
+                ``-threads``. Lets ffmpeg pick (usually one per core) if None.
         """
         self.temp_dir = temp_dir or Path(tempfile.gettempdir()) / "video-audio-combiner"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.threads = threads
+
+    def _thread_args(self) -> list[str]:
+        """Get the ``-threads`` output option for ffmpeg commands, if configured."""
+        return ["-threads", str(self.threads)] if self.threads else []
 
     def _parse_framerate(self, framerate_str: str) -> float | None:
         """Parse framerate string (e.g., '24000/1001') to float.
@@ -48,6 +195,30 @@ class FFmpegService:
         except (ValueError, ZeroDivisionError):
             return None
 
+    def _probe_and_validate(
+        self, file_path: str, label: str = "File"
+    ) -> tuple[os.stat_result, dict]:
+        """Check that a file exists and probe it, with a single stat call.
+
+        Args:
+            file_path: Path to the media file.
+            label: How to name the file in the not-found error message.
+
+        Returns:
+            Tuple of the file's stat result and the parsed ffprobe JSON output.
+            The probe dict is shared with the cache; don't mutate it.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If ffprobe fails.
+        """
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"{label} not found: {file_path}") from e
+
+        return stat, _probe(str(Path(file_path)), stat.st_size, stat.st_mtime_ns)
+
     def _run_ffprobe(self, file_path: str) -> dict:
         """Run ffprobe and return JSON output.
 
@@ -55,34 +226,13 @@ class FFmpegService:
             file_path: Path to the video file.
 
         Returns:
-            Parsed JSON output from ffprobe.
+            Parsed JSON output from ffprobe. Shared with the cache; don't mutate.
 
         Raises:
             FileNotFoundError: If the file doesn't exist.
             ValueError: If ffprobe fails.
         """
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        cmd = [
-            "ffprobe",
-            "-v",
-            "quiet",
-            "-print_format",
-            "json",
-            "-show_format",
-            "-show_streams",
-            str(path),
-        ]
-
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return json.loads(result.stdout)
-        except subprocess.CalledProcessError as e:
-            raise ValueError(f"ffprobe failed: {e.stderr}") from e
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse ffprobe output: {e}") from e
+        return self._probe_and_validate(file_path)[1]
 
     def get_audio_tracks(self, file_path: str) -> TracksResponse:
         """Get audio tracks from a video file.
@@ -111,19 +261,19 @@ class FFmpegService:
         # Extract audio streams
         audio_streams = [s for s in probe_data.get("streams", []) if s.get("codec_type") == "audio"]
 
-        tracks = []
-        for i, stream in enumerate(audio_streams):
-            tags = stream.get("tags", {})
-            track = AudioTrack(
+        # Fields are coerced here, so the models skip validation
+        tracks = [
+            AudioTrack.model_construct(
                 index=i,
                 codec=stream.get("codec_name", "unknown"),
-                language=tags.get("language"),
-                title=tags.get("title"),
-                channels=stream.get("channels", 2),
+                language=stream.get("tags", {}).get("language"),
+                title=stream.get("tags", {}).get("title"),
+                channels=int(stream.get("channels", 2)),
                 sample_rate=int(stream.get("sample_rate", 44100)),
                 duration_seconds=float(stream.get("duration", duration_seconds)),
             )
-            tracks.append(track)
+            for i, stream in enumerate(audio_streams)
+        ]
 
         return TracksResponse(
             file_path=file_path,
@@ -132,31 +282,84 @@ class FFmpegService:
             video_framerate=video_framerate,
         )
 
-    def extract_audio(
+    def _tempo_ratio(
+        self, source_framerate: float | None, target_framerate: float | None
+    ) -> float | None:
+        """Get the tempo ratio needed to retime audio to a target framerate.
+
+        Args:
+            source_framerate: Framerate of the video the audio belongs to.
+            target_framerate: Framerate the audio should match.
+
+        Returns:
+            Source to target framerate ratio, or None if no stretching is needed.
+        """
+        if (
+            target_framerate is None
+            or source_framerate is None
+            or abs(source_framerate - target_framerate) <= 0.01
+        ):
+            return None
+        # Calculate tempo ratio: source_fps / target_fps
+        # If source is 25fps and target is 23.976fps, ratio is ~1.0427
+        # Audio needs to be slowed by 1/ratio to match target timing
+        return source_framerate / target_framerate
+
+    def _track_output_args(
+        self, track_index: int, tempo_ratio: float | None, preserve_pitch: bool
+    ) -> list[str]:
+        """Build the ffmpeg output options that decode one track to 22050 Hz mono PCM.
+
+        Args:
+            track_index: Index of the audio track to extract.
+            tempo_ratio: Tempo ratio to stretch by, or None.
+            preserve_pitch: If False, leave out the atempo filter; the caller
+                retimes the output by rewriting its sample rate instead.
+
+        Returns:
+            Output options for the track, without the output path.
+        """
+        args = ["-map", f"0:a:{track_index}"]
+        if tempo_ratio is not None and preserve_pitch:
+            args.extend(["-filter:a", self._atempo_filter(tempo_ratio)])
+        args.extend(
+            [
+                "-acodec",
+                "pcm_s16le",
+                "-ar",
+                str(ANALYSIS_SAMPLE_RATE),  # 22050 Hz for analysis (good balance)
+                "-ac",
+                "1",  # Mono for analysis
+                *self._thread_args(),
+            ]
+        )
+        return args
+
+    def _extraction_command(
         self,
         file_path: str,
         track_index: int,
-        target_framerate: float | None = None,
-    ) -> ExtractResponse:
-        """Extract an audio track to WAV format, optionally stretching for framerate.
+        target_framerate: float | None,
+        preserve_pitch: bool = True,
+    ) -> tuple[list[str], float | None, float | None]:
+        """Build the ffmpeg command that decodes a track to 22050 Hz mono PCM.
 
         Args:
             file_path: Path to the video file.
             track_index: Index of the audio track to extract.
             target_framerate: If provided, stretch audio to match this framerate.
+            preserve_pitch: If False, leave out the atempo filter; the caller
+                retimes the output by rewriting its sample rate instead.
 
         Returns:
-            ExtractResponse with path to extracted WAV file.
+            Tuple of the command without its output argument, the source video
+            framerate and the tempo ratio (None if no stretching is needed).
 
         Raises:
             FileNotFoundError: If the file doesn't exist.
-            ValueError: If the track index is invalid or extraction fails.
+            ValueError: If the track index is invalid.
         """
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        # Get tracks to validate index and get source framerate
+        # Get tracks to validate the file and index and get source framerate
         tracks_response = self.get_audio_tracks(file_path)
         if track_index < 0 or track_index >= len(tracks_response.tracks):
             raise ValueError(
@@ -165,78 +368,120 @@ class FFmpegService:
             )
 
         source_framerate = tracks_response.video_framerate
+        tempo_ratio = self._tempo_ratio(source_framerate, target_framerate)
 
-        # Generate output path
-        output_path = self.temp_dir / f"{path.stem}_track{track_index}.wav"
-
-        # Extract audio
         cmd = [
-            "ffmpeg",
+            *FFMPEG,
             "-y",  # Overwrite output
             "-i",
-            str(path),
-            "-map",
-            f"0:a:{track_index}",
-            "-acodec",
-            "pcm_s16le",
-            "-ar",
-            "22050",  # 22050 Hz for analysis (good balance)
-            "-ac",
-            "1",  # Mono for analysis
-            str(output_path),
+            file_path,
+            *self._track_output_args(track_index, tempo_ratio, preserve_pitch),
         ]
 
-        try:
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
-        except subprocess.CalledProcessError as e:
-            raise ValueError(f"FFmpeg extraction failed: {e.stderr}") from e
+        return cmd, source_framerate, tempo_ratio
 
-        # Calculate tempo ratio and stretch if needed
-        tempo_ratio = None
-        stretched = False
+    def _extract_response(
+        self,
+        output_path: Path,
+        source_framerate: float | None,
+        tempo_ratio: float | None,
+        preserve_pitch: bool,
+    ) -> ExtractResponse:
+        """Finish an extracted WAV and describe it.
 
-        if (
-            target_framerate is not None
-            and source_framerate is not None
-            and abs(source_framerate - target_framerate) > 0.01
-        ):
-            # Calculate tempo ratio: source_fps / target_fps
-            # If source is 25fps and target is 23.976fps, ratio is ~1.0427
-            # Audio needs to be slowed by 1/ratio to match target timing
-            tempo_ratio = source_framerate / target_framerate
-
-            # Stretch the audio
-            stretched_path = self.temp_dir / f"{path.stem}_track{track_index}_stretched.wav"
-            self.stretch_audio(output_path, stretched_path, tempo_ratio)
-
-            # Replace original with stretched version
-            output_path.unlink()
-            stretched_path.rename(output_path)
-            stretched = True
-
-        # Get duration of final audio
-        probe_data = self._run_ffprobe(str(output_path))
-        duration_seconds = float(probe_data.get("format", {}).get("duration", 0))
+        Args:
+            output_path: Path of the WAV ffmpeg wrote.
+            source_framerate: Framerate of the source video.
+            tempo_ratio: Tempo ratio the track was retimed by, or None.
+            preserve_pitch: Whether the retiming was done by atempo (True) or is
+                still to be applied to the header (False).
+
+        Returns:
+            ExtractResponse for the WAV.
+        """
+        if tempo_ratio is not None and not preserve_pitch:
+            self._rewrite_wav_sample_rate(output_path, round(ANALYSIS_SAMPLE_RATE / tempo_ratio))
+
+        # Get duration of final audio from the WAV header, no ffprobe needed
+        duration_seconds = sf.info(str(output_path)).duration
 
         return ExtractResponse(
             wav_path=str(output_path),
             duration_seconds=duration_seconds,
             source_framerate=source_framerate,
             tempo_ratio=tempo_ratio,
-            stretched=stretched,
+            stretched=tempo_ratio is not None,
         )
 
-    def stretch_audio(self, input_path: Path, output_path: Path, tempo_ratio: float) -> None:
-        """Stretch audio by tempo ratio using FFmpeg atempo filter.
+    def extract_audio(
+        self,
+        file_path: str,
+        track_index: int,
+        target_framerate: float | None = None,
+        preserve_pitch: bool = True,
+    ) -> ExtractResponse:
+        """Extract an audio track to WAV format, optionally stretching for framerate.
 
         Args:
-            input_path: Path to the input WAV file.
-            output_path: Path for the output stretched WAV file.
-            tempo_ratio: Ratio to stretch by (>1 speeds up, <1 slows down).
-                        Audio needs to be stretched by 1/tempo_ratio to match.
+            file_path: Path to the video file.
+            track_index: Index of the audio track to extract.
+            target_framerate: If provided, stretch audio to match this framerate.
+            preserve_pitch: If True, stretch with ffmpeg's atempo filter, which keeps
+                the pitch. If False, only rewrite the WAV's sample rate, shifting the
+                pitch like a tape speed change.
+
+        Returns:
+            ExtractResponse with path to extracted WAV file.
 
         Raises:
-            ValueError: If stretching fails.
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If the track index is invalid or extraction fails.
+        """
+        cmd, source_framerate, tempo_ratio = self._extraction_command(
+            file_path, track_index, target_framerate, preserve_pitch
+        )
+
+        # Generate output path
+        output_path = self.temp_dir / f"{Path(file_path).stem}_track{track_index}.wav"
+        cmd.append(str(output_path))
+
+        try:
+            _run_ffmpeg(cmd)
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"FFmpeg extraction failed: {e.stderr}") from e
+
+        return self._extract_response(output_path, source_framerate, tempo_ratio, preserve_pitch)
+
+    def _rewrite_wav_sample_rate(self, wav_path: Path, sample_rate: int) -> None:
+        """Change the sample rate stored in a WAV header without touching the samples.
+
+        Args:
+            wav_path: Path to a PCM WAV file whose ``fmt`` chunk comes first, as
+                written by ffmpeg.
+            sample_rate: New sample rate in Hz.
+
+        Raises:
+            ValueError: If the file doesn't have the expected header layout.
+        """
+        with open(wav_path, "r+b") as f:
+            header = f.read(36)
+            if len(header) < 36 or header[0:4] != b"RIFF" or header[8:16] != b"WAVEfmt ":
+                raise ValueError(f"Unexpected WAV header in {wav_path}")
+            (block_align,) = struct.unpack_from("<H", header, 32)
+            # Sample rate and byte rate are the two u32 fields at offsets 24 and 28
+            f.seek(24)
+            f.write(struct.pack("<II", sample_rate, sample_rate * block_align))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _atempo_filter(tempo_ratio: float) -> str:
+        """Build the atempo filter chain that undoes a framerate tempo ratio.
+
+        Args:
+            tempo_ratio: Source to target framerate ratio (see ``stretch_audio``).
+
+        Returns:
+            Comma-separated atempo filters for ``-filter:a``.
         """
         # We need to apply 1/tempo_ratio to slow down audio to match target
         # atempo filter: >1 speeds up, <1 slows down
@@ -254,21 +499,35 @@ class FFmpegService:
                 remaining = remaining / 2.0
         filters.append(f"atempo={remaining:.6f}")
 
-        filter_str = ",".join(filters)
+        return ",".join(filters)
+
+    def stretch_audio(self, input_path: Path, output_path: Path, tempo_ratio: float) -> None:
+        """Stretch audio by tempo ratio using FFmpeg atempo filter.
+
+        Args:
+            input_path: Path to the input WAV file.
+            output_path: Path for the output stretched WAV file.
+            tempo_ratio: Ratio to stretch by (>1 speeds up, <1 slows down).
+                        Audio needs to be stretched by 1/tempo_ratio to match.
+
+        Raises:
+            ValueError: If stretching fails.
+        """
         cmd = [
-            "ffmpeg",
+            *FFMPEG,
             "-y",
             "-i",
             str(input_path),
             "-filter:a",
-            filter_str,
+            self._atempo_filter(tempo_ratio),
             "-acodec",
             "pcm_s16le",
+            *self._thread_args(),
             str(output_path),
         ]
 
         try:
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            _run_ffmpeg(cmd)
         except subprocess.CalledProcessError as e:
             raise ValueError(f"FFmpeg audio stretching failed: {e.stderr}") from e
 
@@ -296,33 +555,39 @@ class FFmpegService:
         Returns:
             MergeResponse with result information.
         """
-        import shutil
-
         video = Path(video_path)
         audio = Path(audio_path)
 
-        if not video.exists():
-            raise FileNotFoundError(f"Video file not found: {video_path}")
-        if not audio.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        # Probe both inputs once; this also checks that they exist
+        _, video_probe = self._probe_and_validate(video_path, "Video file")
+        _, audio_probe = self._probe_and_validate(audio_path, "Audio file")
 
         # Convert offset to seconds
         offset_seconds = offset_ms / 1000.0
 
         # Get the index for the new audio track
-        new_track_index = self._count_audio_tracks(video_path)
+        new_track_index = self._count_audio_tracks(video_probe)
 
         # Determine actual output path (use temp file if modifying original)
         if modify_original:
-            actual_output = self.temp_dir / f"merge_temp{video.suffix}"
+            # Use a unique temp file next to the original, so replacing it is a rename
+            temp_parent = video.parent if os.access(video.parent, os.W_OK) else self.temp_dir
+            fd, temp_name = tempfile.mkstemp(
+                dir=temp_parent, prefix=".merge_temp_", suffix=video.suffix
+            )
+            os.close(fd)
+            actual_output = Path(temp_name)
             final_output = video_path
         else:
             actual_output = Path(output_path)
             final_output = output_path
 
+        # Copy the new audio as-is if the output container supports its codec
+        audio_codec = "copy" if self._can_copy_audio(audio_probe, actual_output.suffix) else "aac"
+
         # Build FFmpeg command
         cmd = [
-            "ffmpeg",
+            *FFMPEG,
             "-y",  # Overwrite output
             "-i",
             str(video),
@@ -337,7 +602,7 @@ class FFmpegService:
             "-c",
             "copy",  # Copy all streams
             f"-c:a:{new_track_index}",
-            "aac",  # Encode new audio as AAC
+            audio_codec,  # Encode new audio as AAC unless it can be copied
             f"-metadata:s:a:{new_track_index}",
             f"language={language}",
         ]
@@ -351,26 +616,53 @@ class FFmpegService:
                 ]
             )
 
+        cmd.extend(self._thread_args())
         cmd.append(str(actual_output))
 
         try:
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            _run_ffmpeg(cmd)
 
             # If modifying original, replace the original file with the temp file
             if modify_original:
-                shutil.move(str(actual_output), final_output)
-
-            return MergeResponse(output_path=final_output, success=True)
+                # mkstemp created the temp file as 0600; keep the original's permissions
+                shutil.copymode(video, actual_output)
+                if actual_output.parent == video.parent:
+                    os.replace(actual_output, final_output)
+                else:
+                    shutil.move(str(actual_output), final_output)
         except subprocess.CalledProcessError as e:
-            # Clean up temp file if it exists
-            if modify_original and actual_output.exists():
-                actual_output.unlink()
             raise ValueError(f"FFmpeg merge failed: {e.stderr}") from e
+        finally:
+            # Clean up the temp file if it wasn't moved into place
+            if modify_original:
+                with contextlib.suppress(OSError):
+                    actual_output.unlink(missing_ok=True)
 
-    def _count_audio_tracks(self, file_path: str) -> int:
-        """Count the number of audio tracks in a video file."""
-        tracks_response = self.get_audio_tracks(file_path)
-        return len(tracks_response.tracks)
+        return MergeResponse(output_path=final_output, success=True)
+
+    def _can_copy_audio(self, probe_data: dict, container_suffix: str) -> bool:
+        """Check if an audio file's codec can be muxed into a container without re-encoding.
+
+        Args:
+            probe_data: ffprobe output for the audio file.
+            container_suffix: Suffix of the output video file (e.g. ``.mkv``).
+
+        Returns:
+            True if the first audio stream's codec is supported by the container.
+        """
+        copyable = _COPYABLE_AUDIO_CODECS.get(container_suffix.lower())
+        if not copyable:
+            return False
+        codecs = [
+            s.get("codec_name")
+            for s in probe_data.get("streams", [])
+            if s.get("codec_type") == "audio"
+        ]
+        return bool(codecs) and codecs[0] in copyable
+
+    def _count_audio_tracks(self, probe_data: dict) -> int:
+        """Count the number of audio tracks in a video file's ffprobe output."""
+        return sum(1 for s in probe_data.get("streams", []) if s.get("codec_type") == "audio")
 
     def generate_preview(
         self,
@@ -399,8 +691,7 @@ class FFmpegService:
         video = Path(video_path)
         audio = Path(audio_path)
 
-        if not video.exists():
-            raise FileNotFoundError(f"Video file not found: {video_path}")
+        video_stat, video_probe = self._probe_and_validate(video_path, "Video file")
         if not audio.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
@@ -415,9 +706,14 @@ class FFmpegService:
         # So for the same video position, we need audio from an earlier point
         audio_start_time = start_time_seconds - offset_seconds
 
-        cmd = [
-            "ffmpeg",
-            "-y",  # Overwrite output
+        copy_video = self._can_copy_preview_video(
+            video_path, video_stat, video_probe, max(0, start_time_seconds)
+        )
+
+        # Decode on the GPU when re-encoding, if ffmpeg finds a hwaccel
+        hwaccel_args = [] if copy_video else ["-hwaccel", "auto"]
+
+        input_args = [
             "-ss",
             str(max(0, start_time_seconds)),  # Seek in video
             "-i",
@@ -435,104 +731,171 @@ class FFmpegService:
         # Handle audio mapping based on mute settings
         if mute_main_audio and mute_secondary_audio:
             # Both muted - no audio
-            cmd.extend(["-an"])
+            audio_args = ["-an"]
         elif mute_main_audio and not mute_secondary_audio:
             # Only secondary audio (current default behavior)
-            cmd.extend(["-map", "1:a:0"])
+            audio_args = ["-map", "1:a:0"]
         elif not mute_main_audio and mute_secondary_audio:
             # Only main audio
-            cmd.extend(["-map", "0:a:0"])
+            audio_args = ["-map", "0:a:0"]
         else:
             # Both audios - mix them together
-            cmd.extend(
-                [
-                    "-filter_complex",
-                    "[0:a:0][1:a:0]amix=inputs=2:duration=first[aout]",
-                    "-map",
-                    "[aout]",
-                ]
-            )
+            audio_args = [
+                "-filter_complex",
+                "[0:a:0][1:a:0]amix=inputs=2:duration=first[aout]",
+                "-map",
+                "[aout]",
+            ]
 
         # Video encoding settings
-        cmd.extend(
-            [
-                "-c:v",
-                "libx264",  # Re-encode video (needed for accurate seeking)
-                "-preset",
-                "ultrafast",  # Fast encoding for preview
-                "-crf",
-                "28",  # Lower quality for smaller file
-            ]
-        )
+        software_codec_args = [
+            "-c:v",
+            "libx264",  # Re-encode video (needed for accurate seeking)
+            "-preset",
+            "ultrafast",  # Fast encoding for preview
+            "-crf",
+            "28",  # Lower quality for smaller file
+        ]
+        hardware_encoder = None if copy_video else _hardware_h264_encoder()
+        if copy_video:
+            # The clip starts on a keyframe, so the input seek is exact without decoding
+            video_codec_args: Iterable[str] = ["-c:v", "copy"]
+        elif hardware_encoder:
+            # Re-encode on the GPU's fixed-function encoder when there is one
+            video_codec_args = hardware_encoder
+        else:
+            video_codec_args = software_codec_args
 
         # Audio encoding (if any audio is present)
-        if not (mute_main_audio and mute_secondary_audio):
-            cmd.extend(
-                [
-                    "-c:a",
-                    "aac",
-                    "-b:a",
-                    "128k",
-                ]
-            )
-
-        cmd.extend(
-            [
-                "-movflags",
-                "+faststart",  # Enable streaming
-                str(output_path),
-            ]
+        audio_codec_args = (
+            [] if mute_main_audio and mute_secondary_audio else ["-c:a", "aac", "-b:a", "128k"]
         )
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
+        output_args = [
+            "-movflags",
+            "+faststart",  # Enable streaming
+            *self._thread_args(),
+            str(output_path),
+        ]
+
+        def preview_command(hwaccel_args: list[str], video_codec_args: Iterable[str]) -> list[str]:
+            return list(
+                itertools.chain(
+                    FFMPEG,
+                    ["-y"],  # Overwrite output
+                    hwaccel_args,
+                    input_args,
+                    audio_args,
+                    video_codec_args,
+                    audio_codec_args,
+                    output_args,
+                )
+            )
+
+        try:
+            try:
+                _run_ffmpeg(preview_command(hwaccel_args, video_codec_args))
+            except subprocess.CalledProcessError:
+                if hardware_encoder is None:
+                    raise
+                # Hardware encoders can still fail on some input; retry in software
+                _run_ffmpeg(preview_command([], software_codec_args))
+        except subprocess.CalledProcessError as e:
             # Extract meaningful error from stderr
-            stderr = result.stderr or ""
+            stderr = e.stderr or ""
             # Look for lines containing actual errors
-            error_lines = []
-            for line in stderr.split("\n"):
-                line_lower = line.lower()
-                if any(
-                    keyword in line_lower
-                    for keyword in [
-                        "error",
-                        "invalid",
-                        "failed",
-                        "cannot",
-                        "unable",
-                        "no such",
-                        "not found",
-                        "does not",
-                        "undefined",
-                        "unknown",
-                    ]
-                ):
-                    error_lines.append(line.strip())
+            error_lines = [
+                line.strip() for line in stderr.splitlines() if _FFMPEG_ERROR_PATTERN.search(line)
+            ]
 
             if error_lines:
                 error_msg = "; ".join(error_lines[-3:])  # Last 3 error lines
             else:
                 # Fallback: last 3 non-empty lines
-                lines = [line.strip() for line in stderr.split("\n") if line.strip()]
+                lines = [line.strip() for line in stderr.splitlines() if line.strip()]
                 error_msg = "; ".join(lines[-3:]) if lines else "Unknown FFmpeg error"
 
-            raise ValueError(f"FFmpeg preview generation failed: {error_msg}")
+            raise ValueError(f"FFmpeg preview generation failed: {error_msg}") from e
 
         return PreviewResponse(
             preview_path=str(output_path),
             duration_seconds=duration_seconds,
         )
 
+    def _can_copy_preview_video(
+        self, video_path: str, stat: os.stat_result, probe_data: dict, start: float
+    ) -> bool:
+        """Check if a preview starting at ``start`` can stream-copy 8-bit H.264 from a keyframe.
+
+        Args:
+            video_path: Path to the video file.
+            stat: Stat result of the video file.
+            probe_data: ffprobe output for the video file.
+            start: Preview start time in seconds.
+
+        Returns:
+            True if the first video stream can be copied into the preview.
+        """
+        video_streams = [s for s in probe_data.get("streams", []) if s.get("codec_type") == "video"]
+        if not video_streams:
+            return False
+        stream = video_streams[0]
+        if stream.get("codec_name") != "h264" or stream.get("pix_fmt") != "yuv420p":
+            return False
+
+        try:
+            packet = _first_video_packet(
+                str(Path(video_path)), stat.st_size, stat.st_mtime_ns, start
+            )
+        except ValueError:
+            return False
+        if packet is None:
+            return False
+        try:
+            # Packet times are absolute; -ss is relative to the container start
+            packet_time = float(packet.get("pts_time")) - float(
+                probe_data.get("format", {}).get("start_time", 0)
+            )
+        except (TypeError, ValueError):
+            return False
+
+        framerate = self._parse_framerate(stream.get("r_frame_rate", "")) or 25.0
+        return "K" in packet.get("flags", "") and abs(packet_time - start) < 0.5 / framerate
+
+    def _frame_path(
+        self, video_path: str, mtime_ns: int, time_seconds: float, accurate_seek: bool
+    ) -> Path:
+        """Get the cache path of an extracted frame.
+
+        Args:
+            video_path: Path to the video file.
+            mtime_ns: Modification time of the video file.
+            time_seconds: Time position in seconds.
+            accurate_seek: Whether the frame is exact or snapped to a keyframe.
+
+        Returns:
+            Path of the frame's JPEG in the temp directory.
+        """
+        # Hash path + mtime + time, so a replaced file doesn't serve stale frames
+        key = f"{video_path}:{mtime_ns}:{time_seconds:.3f}"
+        if not accurate_seek:
+            key += ":keyframe"
+        path_hash = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return self.temp_dir / f"frame_{path_hash}.jpg"
+
     def extract_frame(
         self,
         video_path: str,
         time_seconds: float,
+        accurate_seek: bool = True,
     ) -> FrameResponse:
         """Extract a single frame from video at the specified time.
 
         Args:
             video_path: Path to the video file.
             time_seconds: Time position in seconds.
+            accurate_seek: If False, take the nearest keyframe at or before the time
+                instead of decoding up to the exact frame.
 
         Returns:
             FrameResponse with path to the extracted frame image.
@@ -541,48 +904,200 @@ class FFmpegService:
             FileNotFoundError: If the video file doesn't exist.
             ValueError: If frame extraction fails.
         """
-        import hashlib
-
         video = Path(video_path)
         if not video.exists():
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
-        # Generate output path with timestamp to allow caching
-        # Use a hash of path + time to create unique filename
-        path_hash = hashlib.md5(f"{video_path}:{time_seconds}".encode()).hexdigest()[:12]
-        output_path = self.temp_dir / f"frame_{path_hash}.jpg"
+        output_path = self._frame_path(
+            video_path, video.stat().st_mtime_ns, time_seconds, accurate_seek
+        )
 
         # If frame already exists, return it (caching)
         if output_path.exists():
             return FrameResponse(frame_path=str(output_path), time_seconds=time_seconds)
 
-        cmd = [
-            "ffmpeg",
-            "-y",  # Overwrite output
-            "-ss",
-            str(max(0, time_seconds)),  # Seek to position
-            "-i",
-            str(video),
-            "-vframes",
-            "1",  # Extract only one frame
-            "-q:v",
-            "2",  # High quality JPEG (1-31, lower is better)
-            str(output_path),
-        ]
+        cmd = [*FFMPEG, "-y"]  # Overwrite output
+        if not accurate_seek:
+            # Stop at the keyframe and only decode keyframes
+            cmd.extend(["-noaccurate_seek", "-skip_frame", "nokey"])
+        cmd.extend(
+            [
+                "-ss",
+                str(max(0, time_seconds)),  # Seek to position
+                "-i",
+                str(video),
+                "-vframes",
+                "1",  # Extract only one frame
+                "-q:v",
+                "2",  # High quality JPEG (1-31, lower is better)
+                *self._thread_args(),
+                str(output_path),
+            ]
+        )
 
         try:
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            _run_ffmpeg(cmd)
         except subprocess.CalledProcessError as e:
             raise ValueError(f"FFmpeg frame extraction failed: {e.stderr}") from e
+        # ffmpeg exits cleanly without writing anything when seeking past the end
+        if not output_path.exists():
+            raise ValueError(f"No frame at {time_seconds} s in {video_path}")
 
         return FrameResponse(frame_path=str(output_path), time_seconds=time_seconds)
 
+    def _constant_framerate(self, probe_data: dict) -> float | None:
+        """Get the framerate of a video's first stream if it is constant.
+
+        Args:
+            probe_data: ffprobe output for the video file.
+
+        Returns:
+            Frames per second, or None if there is no video stream or the real and
+            average framerates disagree (a sign of variable framerate).
+        """
+        video_streams = [s for s in probe_data.get("streams", []) if s.get("codec_type") == "video"]
+        if not video_streams:
+            return None
+        stream = video_streams[0]
+        framerate = self._parse_framerate(stream.get("r_frame_rate", ""))
+        average = self._parse_framerate(stream.get("avg_frame_rate", ""))
+        if framerate is None or average is None or abs(framerate - average) > 0.01:
+            return None
+        return framerate
+
+    def _extract_frame_cluster(
+        self,
+        video_path: str,
+        times_seconds: list[float],
+        output_paths: list[Path],
+        framerate: float,
+    ) -> None:
+        """Extract frames at nearby times with one seek and one ffmpeg run.
+
+        Args:
+            video_path: Path to the video file.
+            times_seconds: Sorted time positions in seconds, all >= 0.
+            output_paths: Where to put the frame for each time.
+            framerate: Constant framerate of the video.
+
+        Raises:
+            ValueError: If frame extraction fails.
+        """
+        # Frame at or after each time, where an accurate single-frame seek lands
+        indices = [math.ceil(t * framerate - 1e-6) for t in times_seconds]
+        frame_numbers = [i - indices[0] for i in indices]
+        unique_numbers = sorted(set(frame_numbers))
+        # Seek half a frame early so the first wanted frame is never skipped
+        start = max(0.0, (indices[0] - 0.5) / framerate)
+        select = "+".join(f"eq(n,{n})" for n in unique_numbers)
+
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as batch_dir:
+            cmd = [
+                *FFMPEG,
+                "-y",
+                "-ss",
+                str(start),
+                "-i",
+                video_path,
+                "-vf",
+                f"select='{select}'",
+                "-vsync",
+                "0",  # One image per selected frame, no duplication
+                "-frames:v",
+                str(len(unique_numbers)),  # Stop decoding after the last wanted frame
+                "-q:v",
+                "2",  # High quality JPEG (1-31, lower is better)
+                *self._thread_args(),
+                os.path.join(batch_dir, "%06d.jpg"),
+            ]
+
+            try:
+                _run_ffmpeg(cmd)
+            except subprocess.CalledProcessError as e:
+                raise ValueError(f"FFmpeg frame extraction failed: {e.stderr}") from e
+
+            # Images are numbered in selection order, so a missing one would shift
+            # every later image into the wrong time's cache slot. Keep none then and
+            # let the caller seek for each time instead
+            if len(os.listdir(batch_dir)) != len(unique_numbers):
+                return
+
+            for number, output_path in zip(frame_numbers, output_paths, strict=True):
+                image = os.path.join(batch_dir, f"{unique_numbers.index(number) + 1:06d}.jpg")
+                shutil.copyfile(image, output_path)
+
+    def extract_frames(
+        self,
+        video_path: str,
+        times_seconds: list[float],
+        accurate_seek: bool = True,
+    ) -> FramesResponse:
+        """Extract frames at several times from one video, batching nearby ones.
+
+        Args:
+            video_path: Path to the video file.
+            times_seconds: Time positions in seconds.
+            accurate_seek: If False, snap each time to a keyframe (see ``extract_frame``).
+
+        Returns:
+            FramesResponse with one frame per requested time, in the same order.
+
+        Raises:
+            FileNotFoundError: If the video file doesn't exist.
+            ValueError: If any frame extraction fails.
+        """
+        stat, probe_data = self._probe_and_validate(video_path, "Video file")
+        output_paths = {
+            t: self._frame_path(video_path, stat.st_mtime_ns, t, accurate_seek)
+            for t in times_seconds
+        }
+        pending = sorted(
+            (t for t, path in output_paths.items() if not path.exists()), key=lambda t: max(0, t)
+        )
+
+        # Group times close enough that decoding between them beats a new seek
+        framerate = self._constant_framerate(probe_data) if accurate_seek else None
+        clusters: list[list[float]] = []
+        for t in pending:
+            if (
+                framerate
+                and clusters
+                and max(0, t) - max(0, clusters[-1][0]) <= FRAME_CLUSTER_SECONDS
+            ):
+                clusters[-1].append(t)
+            else:
+                clusters.append([t])
+
+        for cluster in clusters:
+            if len(cluster) == 1:
+                self.extract_frame(video_path, cluster[0], accurate_seek)
+            else:
+                self._extract_frame_cluster(
+                    video_path,
+                    [max(0, t) for t in cluster],
+                    [output_paths[t] for t in cluster],
+                    framerate,
+                )
+                # Seek separately for times the batch produced no image for
+                for t in cluster:
+                    if not output_paths[t].exists():
+                        self.extract_frame(video_path, t, accurate_seek)
+
+        return FramesResponse(
+            frames=[
+                FrameResponse(frame_path=str(output_paths[t]), time_seconds=t)
+                for t in times_seconds
+            ]
+        )
+
     def cleanup_temp_files(self) -> None:
         """Remove all temporary files created by this service."""
         if self.temp_dir.exists():
-            for file in self.temp_dir.glob("*.wav"):
-                file.unlink()
-            for file in self.temp_dir.glob("*.mp4"):
-                file.unlink()
-            for file in self.temp_dir.glob("*.jpg"):
-                file.unlink()
+            with os.scandir(self.temp_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith((".wav", ".mp4", ".jpg")) and entry.is_file():
+                        os.unlink(entry.path)
+
+        # Envelopes and peaks persisted by the analysis services
+        for name in array_cache.CACHE_NAMES:
+            array_cache.clear(name)
@@ -1,11 +1,101 @@
 """Waveform generation service for audio visualization."""
 
+import functools
+import os
 from pathlib import Path
 
-import librosa
 import numpy as np
+import soundfile as sf
 
 from video_audio_combiner.api.schemas import WaveformResponse
+from video_audio_combiner.services import array_cache
+
+# Peaks reduced per streamed read; at 100 peaks per second this is ~40 s of audio
+PEAKS_PER_BLOCK = 4096
+
+# Bump whenever the peak computation changes, so peaks persisted by
+# _load_peaks are recomputed
+PEAKS_CACHE_VERSION = 2
+
+
+def _block_peaks(y: np.ndarray, samples_per_peak: int, out: np.ndarray) -> None:
+    """Write the max absolute value of each of ``len(out)`` blocks of samples to ``out``."""
+    blocks = y[: len(out) * samples_per_peak].reshape(len(out), samples_per_peak)
+    # max(max, |min|) in float32, since abs(-32768) overflows int16
+    np.maximum(
+        blocks.max(axis=1).astype(np.float32),
+        np.abs(blocks.min(axis=1).astype(np.float32)),
+        out=out,
+    )
+
+
+def _normalize_peaks(peaks: np.ndarray) -> np.ndarray:
+    """Scale peaks to the 0-1 range in place."""
+    if peaks.size > 0:
+        max_peak = float(peaks.max())
+        if max_peak > 0:
+            np.divide(peaks, max_peak, out=peaks)
+    return peaks
+
+
+def _compute_peaks(wav_path: str, samples_per_second: int) -> tuple[np.ndarray, float, int]:
+    """Read a WAV file and compute its normalized waveform peaks."""
+    with sf.SoundFile(wav_path) as f:
+        sr = f.samplerate
+        duration_seconds = f.frames / sr
+
+        # Calculate samples needed
+        total_samples = int(duration_seconds * samples_per_second)
+        if total_samples == 0:
+            return np.empty(0, dtype=np.float32), duration_seconds, sr
+
+        # Calculate samples per peak
+        samples_per_peak = f.frames // total_samples
+        if samples_per_peak == 0:
+            return np.empty(0, dtype=np.float32), duration_seconds, sr
+
+        # Read mono int16 files (as written by extract_audio) without converting
+        mono_int16 = f.channels == 1 and f.subtype == "PCM_16"
+
+        # Stream the file a few thousand peaks at a time
+        peaks = np.empty(total_samples, dtype=np.float32)
+        for start in range(0, total_samples, PEAKS_PER_BLOCK):
+            count = min(PEAKS_PER_BLOCK, total_samples - start)
+            if mono_int16:
+                y = f.read(count * samples_per_peak, dtype="int16")
+            else:
+                y = f.read(count * samples_per_peak, dtype="float32", always_2d=True)
+                y = y.mean(axis=1)
+
+            # A file shorter than its header claims ends the stream early
+            read_peaks = len(y) // samples_per_peak
+            _block_peaks(y, samples_per_peak, peaks[start : start + read_peaks])
+            if read_peaks < count:
+                peaks = peaks[: start + read_peaks]
+                break
+
+    return _normalize_peaks(peaks), duration_seconds, sr
+
+
+@functools.lru_cache(maxsize=16)
+def _load_peaks(
+    wav_path: str, mtime_ns: int, samples_per_second: int
+) -> tuple[np.ndarray, float, int]:
+    """Get the normalized waveform peaks of a WAV file, cached like ``alignment._load_envelope``."""
+    key = (
+        f"{wav_path}:{os.stat(wav_path).st_size}:{mtime_ns}:{samples_per_second}:"
+        f"{PEAKS_CACHE_VERSION}"
+    )
+    peaks = array_cache.load(array_cache.PEAKS, key)
+    if peaks is None:
+        peaks, duration_seconds, sr = _compute_peaks(wav_path, samples_per_second)
+        array_cache.store(array_cache.PEAKS, key, peaks)
+    else:
+        info = sf.info(wav_path)
+        duration_seconds, sr = info.frames / info.samplerate, info.samplerate
+
+    peaks.flags.writeable = False
+    return peaks, duration_seconds, sr
 
 
 class WaveformService:
@@ -27,47 +117,35 @@ class WaveformService:
         Raises:
             FileNotFoundError: If the file doesn't exist.
         """
-        path = Path(wav_path)
-        if not path.exists():
-            raise FileNotFoundError(f"WAV file not found: {wav_path}")
-
-        # Load audio file
-        y, sr = librosa.load(wav_path, sr=None, mono=True)
-        duration_seconds = len(y) / sr
-
-        # Calculate samples needed
-        total_samples = int(duration_seconds * samples_per_second)
-        if total_samples == 0:
-            return WaveformResponse(
-                peaks=[],
-                duration_seconds=duration_seconds,
-                sample_rate=sr,
-            )
+        peaks, duration_seconds, sample_rate = self.compute_peaks(wav_path, samples_per_second)
+        return WaveformResponse(
+            peaks=peaks.tolist(),
+            duration_seconds=duration_seconds,
+            sample_rate=sample_rate,
+        )
 
-        # Calculate samples per peak
-        samples_per_peak = len(y) // total_samples
+    def compute_peaks(
+        self, wav_path: str, samples_per_second: int = 100
+    ) -> tuple[np.ndarray, float, int]:
+        """Compute normalized waveform peaks as an array, without building a response model.
 
-        peaks = []
-        for i in range(total_samples):
-            start = i * samples_per_peak
-            end = min(start + samples_per_peak, len(y))
-            chunk = y[start:end]
+        Args:
+            wav_path: Path to the WAV file.
+            samples_per_second: Number of peak samples per second of audio.
 
-            if len(chunk) > 0:
-                # Use max absolute value for peak
-                peak = float(np.max(np.abs(chunk)))
-                peaks.append(peak)
+        Returns:
+            Tuple of (peaks, duration_seconds, sample_rate) with peaks as a
+            read-only float32 array in the 0-1 range.
 
-        # Normalize peaks to 0-1 range
-        max_peak = max(peaks) if peaks else 1.0
-        if max_peak > 0:
-            peaks = [p / max_peak for p in peaks]
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        path = Path(wav_path)
+        if not path.exists():
+            raise FileNotFoundError(f"WAV file not found: {wav_path}")
 
-        return WaveformResponse(
-            peaks=peaks,
-            duration_seconds=duration_seconds,
-            sample_rate=sr,
-        )
+        path = path.resolve()
+        return _load_peaks(str(path), path.stat().st_mtime_ns, samples_per_second)
 
     def generate_onset_envelope(self, wav_path: str) -> tuple[np.ndarray, int, float]:
         """Generate onset strength envelope for alignment.
@@ -85,17 +163,12 @@ class WaveformService:
         if not path.exists():
             raise FileNotFoundError(f"WAV file not found: {wav_path}")
 
-        # Load at 22050 Hz for analysis
-        y, sr = librosa.load(wav_path, sr=22050, mono=True)
-
-        # Compute onset strength envelope
-        hop_length = 512
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr, hop_length=hop_length)
+        # Shares the envelope caches of AlignmentService (memory and disk)
+        from video_audio_combiner.services.alignment import AlignmentService
 
-        # Normalize
-        if np.max(onset_env) > 0:
-            onset_env = onset_env / np.max(onset_env)
+        alignment_service = AlignmentService()
+        onset_env = alignment_service._envelope(wav_path, "onset")
 
-        hop_length_seconds = hop_length / sr
+        hop_length_seconds = alignment_service.hop_length / alignment_service.sample_rate
 
-        return onset_env, sr, hop_length_seconds
+        return onset_env, alignment_service.sample_rate, hop_length_seconds
@@ -0,0 +1,17 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from video_audio_combiner.services import alignment, array_cache, waveform
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep the on-disk and in-memory array caches private to each test."""
+    monkeypatch.setattr(array_cache, "CACHE_ROOT", tmp_path / "cache")
+    memoized = (alignment._load_envelope, alignment._load_spectrum, waveform._load_peaks)
+    for function in memoized:
+        function.cache_clear()
+    yield
+    for function in memoized:
+        function.cache_clear()
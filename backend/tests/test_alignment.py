@@ -0,0 +1,114 @@
+"""Tests for the alignment service."""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from video_audio_combiner.services.alignment import AlignmentService
+
+
+def _onsets(length: int, seed: int = 0) -> np.ndarray:
+    """Build a sparse random onset envelope."""
+    rng = np.random.default_rng(seed)
+    return (rng.random(length) < 0.02).astype(np.float32) * rng.random(length, dtype=np.float32)
+
+
+@pytest.fixture
+def service() -> AlignmentService:
+    return AlignmentService()
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize(
+    ("main_length", "secondary_length", "lag"),
+    [
+        (2000, 1500, -1000),  # Full resolution search
+        (40000, 5000, -2000),  # Coarse-to-fine search
+    ],
+)
+def test_align_envelopes_secondary_overhangs_main_start(
+    service: AlignmentService, main_length: int, secondary_length: int, lag: int
+):
+    source = _onsets(main_length - lag)
+    main = source[-lag:]
+    secondary = source[:secondary_length]
+
+    lag_frames, confidence = service._align_envelopes(main, secondary)
+
+    assert lag_frames == lag
+    assert confidence > 0
+
+
+@pytest.mark.filterwarnings("error")
+def test_align_envelopes_secondary_overhangs_main_end(service: AlignmentService):
+    source = _onsets(2500)
+    main = source[:2000]
+    secondary = source[1200:]
+
+    lag_frames, confidence = service._align_envelopes(main, secondary)
+
+    assert lag_frames == 1200
+    assert confidence > 0
+
+
+@pytest.mark.filterwarnings("error")
+def test_align_envelopes_tiny_window(service: AlignmentService):
+    source = _onsets(3000)
+    main = source[:2000]
+    secondary = source[10:1510]
+
+    # 500 ms is only 21 frames either way, narrower than the confidence guard band
+    lag_frames, confidence = service._align_envelopes(main, secondary, max_offset_ms=500)
+
+    assert lag_frames == 10
+    assert confidence > 0
+
+
+def test_align_envelopes_window_limits_lag(service: AlignmentService):
+    source = _onsets(3000)
+    main = source[:2000]
+    secondary = source[200:1700]
+
+    lag_frames, _ = service._align_envelopes(main, secondary, max_offset_ms=500)
+
+    assert abs(lag_frames) <= 21
+
+
+@pytest.mark.filterwarnings("error")
+async def test_detect_alignment_sub_hop_input(service: AlignmentService, tmp_path):
+    main_path = tmp_path / "main.wav"
+    secondary_path = tmp_path / "secondary.wav"
+    rng = np.random.default_rng(0)
+    sf.write(main_path, rng.uniform(-1, 1, 22050 * 5).astype(np.float32), 22050)
+    # Shorter than one hop, so its envelope is empty
+    sf.write(secondary_path, rng.uniform(-1, 1, 100).astype(np.float32), 22050)
+
+    result = await service.detect_alignment(str(main_path), str(secondary_path))
+
+    assert result.offset_ms == 0.0
+    assert result.confidence == 0.0
+
+
+async def test_detect_alignment_missing_file(service: AlignmentService, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        await service.detect_alignment(str(tmp_path / "a.wav"), str(tmp_path / "b.wav"))
+
+
+async def test_compute_correlation_curve_peaks_at_offset(service: AlignmentService, tmp_path):
+    rng = np.random.default_rng(0)
+    # Noise bursts, so the onset envelope has distinct events to match
+    audio = rng.uniform(-1, 1, 22050 * 20).astype(np.float32)
+    audio *= np.repeat(rng.random(20 * 10) < 0.3, 2205)
+    main_path = tmp_path / "main.wav"
+    secondary_path = tmp_path / "secondary.wav"
+    sf.write(main_path, audio, 22050)
+    # Starts 100 hops into the main audio
+    sf.write(secondary_path, audio[100 * 512 : 22050 * 15], 22050)
+
+    lags_ms, correlation = await service.compute_correlation_curve(
+        str(main_path), str(secondary_path)
+    )
+
+    assert len(lags_ms) == len(correlation)
+    assert float(np.max(np.abs(correlation))) == pytest.approx(1.0)
+    assert lags_ms[np.argmax(correlation)] == pytest.approx(100 * 512 / 22050 * 1000)
@@ -0,0 +1,51 @@
+"""Tests for the on-disk array cache."""
+
+import os
+
+import numpy as np
+
+from video_audio_combiner.services import array_cache
+
+
+def test_store_and_load():
+    array = np.arange(10, dtype=np.float32)
+
+    array_cache.store(array_cache.PEAKS, "key", array)
+
+    np.testing.assert_array_equal(array_cache.load(array_cache.PEAKS, "key"), array)
+    assert array_cache.load(array_cache.PEAKS, "other") is None
+    assert array_cache.load(array_cache.ENVELOPES, "key") is None
+
+
+def test_load_unreadable_entry():
+    path = array_cache._entry_path(array_cache.PEAKS, "key")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not an array")
+
+    assert array_cache.load(array_cache.PEAKS, "key") is None
+
+
+def test_store_evicts_oldest_entries(monkeypatch):
+    monkeypatch.setattr(array_cache, "MAX_ENTRIES", 3)
+
+    for i in range(5):
+        array_cache.store(array_cache.PEAKS, f"key{i}", np.full(4, i))
+        # Make the write order unambiguous to the mtime-based eviction
+        os.utime(array_cache._entry_path(array_cache.PEAKS, f"key{i}"), ns=(i, i))
+
+    cached = [array_cache.load(array_cache.PEAKS, f"key{i}") for i in range(5)]
+    assert cached[:2] == [None, None]
+    for i in range(2, 5):
+        np.testing.assert_array_equal(cached[i], np.full(4, i))
+    assert len(list((array_cache.CACHE_ROOT / array_cache.PEAKS).iterdir())) == 3
+
+
+def test_clear():
+    array_cache.store(array_cache.PEAKS, "key", np.zeros(4))
+    array_cache.store(array_cache.ENVELOPES, "key", np.zeros(4))
+    (array_cache.CACHE_ROOT / array_cache.PEAKS / "leftover.tmp").write_bytes(b"")
+
+    array_cache.clear(array_cache.PEAKS)
+
+    assert not list((array_cache.CACHE_ROOT / array_cache.PEAKS).iterdir())
+    assert array_cache.load(array_cache.ENVELOPES, "key") is not None
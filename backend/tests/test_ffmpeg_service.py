@@ -0,0 +1,77 @@
+"""Tests for the ffmpeg service logic that runs without ffmpeg."""
+
+import struct
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from video_audio_combiner.services.ffmpeg_service import FFmpegService
+
+
+@pytest.fixture
+def service(tmp_path) -> FFmpegService:
+    return FFmpegService(temp_dir=tmp_path / "temp")
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_rewrite_wav_sample_rate(service: FFmpegService, tmp_path, channels: int):
+    wav_path = tmp_path / "audio.wav"
+    samples = np.random.default_rng(0).integers(-1000, 1000, (2205, channels), dtype=np.int16)
+    sf.write(wav_path, samples, 22050, subtype="PCM_16")
+
+    service._rewrite_wav_sample_rate(wav_path, 21146)
+
+    header = wav_path.read_bytes()[:36]
+    sample_rate, byte_rate = struct.unpack_from("<II", header, 24)
+    assert sample_rate == 21146
+    assert byte_rate == 21146 * 2 * channels
+    data, read_rate = sf.read(wav_path, dtype="int16", always_2d=True)
+    assert read_rate == 21146
+    np.testing.assert_array_equal(data, samples)
+
+
+def test_rewrite_wav_sample_rate_rejects_other_files(service: FFmpegService, tmp_path):
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"not a wav file")
+
+    with pytest.raises(ValueError):
+        service._rewrite_wav_sample_rate(path, 21146)
+
+
+def _audio_probe(*codecs: str) -> dict:
+    """Build ffprobe output with a video stream and audio streams of the given codecs."""
+    streams = [{"codec_type": "video", "codec_name": "h264"}]
+    streams.extend({"codec_type": "audio", "codec_name": codec} for codec in codecs)
+    return {"streams": streams}
+
+
+@pytest.mark.parametrize(
+    ("suffix", "codec", "expected"),
+    [
+        (".mkv", "aac", True),
+        (".mkv", "flac", True),
+        (".mkv", "opus", True),
+        (".mkv", "pcm_s16le", False),
+        (".mp4", "aac", True),
+        (".mp4", "ac3", True),
+        (".mp4", "opus", False),
+        (".m4v", "eac3", True),
+        (".m4v", "flac", False),
+        (".mov", "aac", True),
+        (".mov", "vorbis", False),
+        (".MKV", "aac", True),
+        (".avi", "aac", False),
+    ],
+)
+def test_can_copy_audio(service: FFmpegService, suffix: str, codec: str, expected: bool):
+    assert service._can_copy_audio(_audio_probe(codec), suffix) is expected
+
+
+def test_can_copy_audio_uses_first_audio_stream(service: FFmpegService):
+    assert service._can_copy_audio(_audio_probe("aac", "pcm_s16le"), ".mp4")
+    assert not service._can_copy_audio(_audio_probe("pcm_s16le", "aac"), ".mp4")
+
+
+def test_can_copy_audio_without_audio(service: FFmpegService):
+    assert not service._can_copy_audio(_audio_probe(), ".mkv")
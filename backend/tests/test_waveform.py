@@ -0,0 +1,76 @@
+"""Tests for the waveform service."""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from video_audio_combiner.services.waveform import WaveformService, _compute_peaks
+
+
+def test_compute_peaks_int16_minimum(tmp_path):
+    wav_path = tmp_path / "audio.wav"
+    samples = np.full(22050, 100, dtype=np.int16)
+    samples[5000] = -32768
+    sf.write(wav_path, samples, 22050, subtype="PCM_16")
+
+    peaks, duration_seconds, sample_rate = _compute_peaks(str(wav_path), 100)
+
+    assert (len(peaks), duration_seconds, sample_rate) == (100, 1.0, 22050)
+    # abs(-32768) would overflow int16 and wrap around to the smallest peak
+    assert peaks[5000 // 220] == 1.0
+    np.testing.assert_allclose(np.delete(peaks, 5000 // 220), 100 / 32768, rtol=1e-6)
+
+
+def test_compute_peaks_stereo_is_mixed_down(tmp_path):
+    wav_path = tmp_path / "audio.wav"
+    samples = np.zeros((22050, 2), dtype=np.float32)
+    samples[:11025, 0] = 0.5
+    samples[11025:] = 0.25
+    sf.write(wav_path, samples, 22050, subtype="FLOAT")
+
+    peaks, _, _ = _compute_peaks(str(wav_path), 100)
+
+    # 0.5 on the left alone and 0.25 on both channels both mix down to 0.25
+    np.testing.assert_allclose(peaks, 1.0)
+
+
+def test_compute_peaks_silence(tmp_path):
+    wav_path = tmp_path / "audio.wav"
+    sf.write(wav_path, np.zeros(22050, dtype=np.int16), 22050, subtype="PCM_16")
+
+    peaks, _, _ = _compute_peaks(str(wav_path), 100)
+
+    assert not peaks.any()
+    assert not np.signbit(peaks).any()
+
+
+def test_compute_peaks_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        WaveformService().compute_peaks(str(tmp_path / "missing.wav"))
+
+
+def test_compute_peaks_across_blocks(tmp_path, monkeypatch):
+    wav_path = tmp_path / "audio.wav"
+    samples = np.random.default_rng(0).integers(-32768, 32767, 22050 * 3, dtype=np.int16)
+    sf.write(wav_path, samples, 22050, subtype="PCM_16")
+    # Several streamed reads, the last one partial
+    monkeypatch.setattr("video_audio_combiner.services.waveform.PEAKS_PER_BLOCK", 7)
+
+    peaks, _, _ = _compute_peaks(str(wav_path), 100)
+
+    expected = np.abs(samples[: 300 * 220].astype(np.float32)).reshape(300, 220).max(axis=1)
+    np.testing.assert_array_equal(peaks, expected / expected.max())
+
+
+def test_compute_peaks_truncated_file(tmp_path):
+    wav_path = tmp_path / "audio.wav"
+    sf.write(wav_path, np.full(22050, 1000, dtype=np.int16), 22050, subtype="PCM_16")
+    # Cut the data chunk in half, leaving the header's length for the whole second
+    data = wav_path.read_bytes()
+    wav_path.write_bytes(data[: len(data) - 22050])
+
+    peaks, duration_seconds, _ = _compute_peaks(str(wav_path), 100)
+
+    assert duration_seconds == pytest.approx(0.5)
+    assert len(peaks) == 50
+    np.testing.assert_array_equal(peaks, 1.0)